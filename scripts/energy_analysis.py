@@ -13,35 +13,675 @@ Autor: Análise de Energia JVM
 
 import pandas as pd
 import numpy as np
-from scipy.stats import bootstrap, pearsonr
 import argparse
+import hashlib
+import importlib.util
 import os
 import glob
 import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-import matplotlib.pyplot as plt
+
+
+try:
+    import numba
+except ImportError:
+    # Numba é opcional: sem ele o bootstrap usa o caminho vetorizado em NumPy
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _boot_stats(x, y, n_resamples, seed):
+        """
+        Médias bootstrap de x, y e x·y (EDP) de cada reamostragem.
+        
+        Cada reamostragem acumula as somas em uma única passada pelos índices
+        sorteados, sem matriz de índices nem arrays intermediários.
+        
+        O estado aleatório do Numba é por thread, e semear só a thread que
+        chama deixaria as demais sem semente; por isso cada reamostragem
+        semeia a sua thread com seed + i, e o resultado não depende de qual
+        thread a executa.
+        """
+        n = x.size
+        out = np.empty((3, n_resamples))
+        for i in numba.prange(n_resamples):
+            np.random.seed(seed + i)
+            sum_x = 0.0
+            sum_y = 0.0
+            sum_xy = 0.0
+            for k in range(n):
+                j = np.random.randint(0, n)
+                sum_x += x[j]
+                sum_y += y[j]
+                sum_xy += x[j] * y[j]
+            out[0, i] = sum_x / n
+            out[1, i] = sum_y / n
+            out[2, i] = sum_xy / n
+        return out
+else:
+    _boot_stats = None
+
+
+# O parser do PyArrow é multithread; sem ele, usa-se o parser C do pandas
+_CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+
+# Colunas usadas pela análise; as demais não são lidas do CSV
+_CSV_COLUMNS = ['algo', 'size', 'freq_mhz', 'joules', 'time_ms']
+_CSV_DTYPES = {'algo': 'category', 'freq_mhz': 'Int32', 'joules': 'float64', 'time_ms': 'float64'}
+
+# Arquivos maiores que isso são lidos em blocos, limitando o pico de memória
+_CSV_STREAM_BYTES = 256 * 1024 * 1024
+_CSV_CHUNKSIZE = 1_000_000
+
+
+def _read_csv(path):
+    """Lê um CSV de resultados com o parser mais rápido disponível."""
+    # O cabeçalho define quais colunas conhecidas existem neste formato
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in _CSV_COLUMNS if col in header]
+    dtype = {col: _CSV_DTYPES[col] for col in usecols if col in _CSV_DTYPES}
+    
+    if os.path.getsize(path) > _CSV_STREAM_BYTES:
+        # O engine pyarrow não suporta chunksize; cada bloco já chega reduzido
+        # às colunas usadas e aos dtypes compactos, sem materializar o texto
+        # do arquivo inteiro de uma vez
+        chunks = list(pd.read_csv(path, usecols=usecols, dtype=dtype, engine='c',
+                                  chunksize=_CSV_CHUNKSIZE))
+        if 'algo' in usecols:
+            # Cada bloco tem suas próprias categorias, e o concat de categorias
+            # distintas viraria texto; com o mesmo conjunto em todos os blocos
+            # a coluna continua categórica
+            categories = pd.api.types.union_categoricals(
+                [chunk['algo'] for chunk in chunks], sort_categories=True).categories
+            for chunk in chunks:
+                chunk['algo'] = chunk['algo'].cat.set_categories(categories)
+        return pd.concat(chunks, ignore_index=True)
+    
+    return pd.read_csv(path, usecols=usecols, dtype=dtype, engine=_CSV_ENGINE)
+
+
+# Frequência no nome de arquivos do formato antigo, como "run_1500mhz.csv"
+_FREQ_RE = re.compile(r'(\d+)mhz', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _frequency_from_filename(filename):
+    """Extrai a frequência (MHz) do nome do arquivo, ou None se ausente."""
+    match = _FREQ_RE.search(filename)
+    return int(match.group(1)) if match else None
+
+
+# Colunas resumidas por média e desvio padrão em cada célula
+_MOMENT_COLUMNS = ['joules', 'time_ms', 'edp']
+
+
+def _moments_mean_std(n, total, sum_sq_dev):
+    """
+    Média e desvio padrão amostral (ddof=1) a partir de n, Σx e Σ(x − x̄)².
+    
+    Vetorizada sobre as células: uma única soma agrupada substitui as
+    passadas separadas de média e desvio. Os quadrados vêm de valores já
+    centrados na média do grupo, sem o cancelamento de Σx² − (Σx)²/n.
+    Células com uma única observação ficam com desvio NaN.
+    """
+    mean = total / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = sum_sq_dev / (n - 1)
+    return mean, np.where(n > 1, np.sqrt(variance), np.nan)
+
+
+def _pearson_from_sums(n, mean_x, mean_y, sum_xy_dev, sum_xx_dev, sum_yy_dev):
+    """
+    Correlação de Pearson de cada célula a partir das somas agrupadas dos
+    desvios em relação à média do grupo: r = Σdxdy / √(Σdx²·Σdy²).
+    
+    Amostras sem variação ficam com NaN, como no pearsonr. Nelas os desvios
+    não são exatamente zero, e sim o erro de arredondamento da média; por
+    isso Σd² até a escala desse erro (n·(n·ε·x̄)²) conta como variância nula.
+    """
+    eps = np.finfo(np.float64).eps
+    constant_x = sum_xx_dev <= n * (n * eps * mean_x) ** 2
+    constant_y = sum_yy_dev <= n * (n * eps * mean_y) ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = sum_xy_dev / np.sqrt(sum_xx_dev * sum_yy_dev)
+    # O arredondamento pode levar |r| ligeiramente acima de 1
+    return np.where(constant_x | constant_y, np.nan, np.clip(r, -1.0, 1.0))
+
+
+def _pearson_p_value(r, n):
+    """
+    p-valor bilateral de H0: ρ = 0, calculado como no pearsonr: sob H0,
+    (r+1)/2 segue Beta(n/2−1, n/2−1), equivalente ao teste t com n−2 graus
+    de liberdade, mas sem underflow para |r| próximo de 1.
+    """
+    from scipy.special import betainc
+    
+    ab = n / 2 - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_value = 2 * betainc(ab, ab, 0.5 * (1 - np.abs(r)))
+    # Com duas observações r é sempre ±1, e o pearsonr devolve p = 1; amostras
+    # sem variação (r NaN) ficam com p NaN, em qualquer tamanho
+    return np.where(np.isnan(r), np.nan, np.where(n > 2, p_value, 1.0))
+
+
+# Reamostragens bootstrap por célula: a largura do IC percentil já se
+# estabiliza bem antes das 10000 de praxe
+DEFAULT_N_RESAMPLES = 2000
+
+# Compressão zlib dos PNGs: o nível 1 é bem mais rápido que o padrão (6) e
+# gera arquivos pouco maiores; ENERGY_PNG_FAST=1 desliga a compressão
+_PNG_PIL_KWARGS = {'compress_level': 0 if os.environ.get('ENERGY_PNG_FAST') == '1' else 1}
+
+# Máximo de algoritmos no gráfico consolidado; acima disso ficam só os
+# gráficos individuais
+_CONSOLIDATED_MAX_ALGORITHMS = 3
+
+
+def _pyplot():
+    """
+    Importa o pyplot sob demanda, com o backend Agg.
+    
+    Carregar o matplotlib custa centenas de ms e só é necessário quando há
+    gráficos a gerar; os gráficos só são salvos em PNG, então o Agg evita
+    carregar um backend de interface gráfica (Qt/Tk).
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+# Cache L2 assumido ao dimensionar os lotes do bootstrap
+_L2_BYTES = 1024 * 1024
+
+# Acima deste tamanho a matriz de pesos não é montada inteira nem memorizada:
+# o produto é feito lote a lote (ver `_bootstrap_weight_batches`)
+_BOOTSTRAP_WEIGHTS_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _bootstrap_batch_size(n):
+    """
+    Número de reamostragens por lote que mantém o lote no cache L2.
+    
+    Cada reamostragem ocupa n*16 bytes: os índices sorteados e a linha de
+    contagens, ambos int64. Amostras muito grandes caem para uma reamostragem
+    por lote, limitando a memória a O(n).
+    """
+    return max(1, min(1024, _L2_BYTES // (n * 16)))
+
+
+def _bootstrap_weight_batches(n, n_resamples):
+    """
+    Gera a matriz de pesos W (n × n_resamples) do bootstrap em lotes de colunas.
+    
+    Na formulação de Neto (2015) cada coluna de W é uma reamostragem: as
+    contagens multinomiais(n, 1/n) de cada observação divididas por n, de modo
+    que as médias bootstrap de todas as métricas saem de data @ W. A semente
+    derivada de n mantém W idêntica em qualquer processo, e os lotes saem do
+    mesmo fluxo aleatório qualquer que seja o seu tamanho.
+    
+    Yields:
+        (start, stop, pesos float32 das colunas start:stop)
+    """
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence([42, n])))
+    batch = _bootstrap_batch_size(n)
+    # Deslocamento de cada linha do lote, para um único bincount contar todas
+    # as reamostragens do lote; calculado uma vez e fatiado no último lote
+    row_offsets = np.arange(batch)[:, np.newaxis] * n
+    
+    for start in range(0, n_resamples, batch):
+        stop = min(start + batch, n_resamples)
+        rows = stop - start
+        # Sortear n índices e contá-los com bincount é equivalente e bem mais
+        # barato que rng.multinomial, que sorteia n-1 binomiais por linha
+        idx = rng.integers(0, n, size=(rows, n))
+        idx += row_offsets[:rows]
+        counts = np.bincount(idx.ravel(), minlength=rows * n).reshape(rows, n)
+        weights = counts.T.astype(np.float32)
+        weights /= n
+        yield start, stop, weights
+
+
+@lru_cache(maxsize=2)
+def _bootstrap_weights(n, n_resamples):
+    """
+    Matriz de pesos W inteira (ver `_bootstrap_weight_batches`), memorizada.
+    
+    Como W só depende de n, ela é sorteada uma vez e compartilhada por todas
+    as células e métricas desse tamanho. Em float32 a matriz ocupa metade da
+    memória (e da banda) de float64, e o BLAS processa o dobro de elementos
+    por instrução SIMD.
+    """
+    weights = np.empty((n, n_resamples), dtype=np.float32)
+    for start, stop, batch_weights in _bootstrap_weight_batches(n, n_resamples):
+        weights[:, start:stop] = batch_weights
+    weights.setflags(write=False)
+    return weights
+
+
+def _bootstrap_sample_means(energy_data, time_data, seed, n_resamples=DEFAULT_N_RESAMPLES):
+    """
+    Gera as distribuições bootstrap das médias de energia, tempo e EDP.
+    
+    As três compartilham as mesmas reamostragens. Com Numba disponível usa o
+    kernel paralelo `_boot_stats`, semeado a partir de `seed`. Caso
+    contrário é um único produto matricial com a matriz de pesos
+    compartilhada de `_bootstrap_weights`.
+    
+    Args:
+        energy_data: Array com as medições de energia (J)
+        time_data: Array com as medições de tempo (ms)
+        seed: SeedSequence da célula (derivada de algoritmo e frequência), usada
+            pelo kernel Numba
+        n_resamples: Número de reamostragens bootstrap
+    
+    Returns:
+        Array 2D (3 × n_resamples): médias de energia, tempo e EDP
+    """
+    if _boot_stats is not None:
+        rng = np.random.Generator(np.random.PCG64(seed))
+        # Cabe em uint32 mesmo somado ao índice da reamostragem
+        numba_seed = int(rng.integers(0, 2**31 - 1))
+        return _boot_stats(np.ascontiguousarray(energy_data, dtype=np.float64),
+                           np.ascontiguousarray(time_data, dtype=np.float64),
+                           n_resamples, numba_seed)
+    
+    # Os dados são centrados na média da amostra: o erro de arredondamento do
+    # float32 fica na escala da dispersão, e não na dos valores
+    center_x, center_y = energy_data.mean(), time_data.mean()
+    x, y = energy_data - center_x, time_data - center_y
+    # Cada linha vira a média ponderada de cada reamostragem; o produto roda
+    # em float32 e só o resultado volta para float64
+    data = np.vstack([x, y, x * y]).astype(np.float32)
+    if x.size * n_resamples * 4 <= _BOOTSTRAP_WEIGHTS_MAX_BYTES:
+        means = data @ _bootstrap_weights(x.size, n_resamples)
+    else:
+        # W inteira não caberia na memória: multiplica lote a lote
+        means = np.empty((3, n_resamples), dtype=np.float32)
+        for start, stop, batch_weights in _bootstrap_weight_batches(x.size, n_resamples):
+            means[:, start:stop] = data @ batch_weights
+    shift_x, shift_y, mean_xy = means.astype(np.float64)
+    # Desfaz a centralização: E[XY] = E[xy] + cx·E[y] + cy·E[x] + cx·cy
+    edp_means = mean_xy + center_x * shift_y + center_y * shift_x + center_x * center_y
+    return np.vstack([center_x + shift_x, center_y + shift_y, edp_means])
+
+
+# Nível de confiança dos intervalos apresentados nos relatórios
+_CONFIDENCE_LEVEL = 0.95
+
+
+def _ci_ranks(n, confidence_level=_CONFIDENCE_LEVEL):
+    """Posições dos limites do IC percentil em uma distribuição de tamanho n."""
+    alpha = (1 - confidence_level) / 2
+    return round(alpha * n), round((1 - alpha) * n) - 1
+
+
+def _percentile_ci(sample_means, mean, confidence_level=_CONFIDENCE_LEVEL):
+    """
+    Calcula o intervalo de confiança percentil de uma distribuição bootstrap.
+    
+    A distribuição precisa estar ordenada, ou ao menos particionada
+    (np.partition) nas posições de `_ci_ranks` para este nível; cada limite é
+    então lido direto pela sua posição.
+    
+    Os limites são estendidos até a média `mean` quando a deixam de fora: em
+    amostras constantes a distribuição inteira difere da média apresentada só
+    pelo arredondamento, e um limite do lado errado daria barras de erro
+    negativas nos gráficos.
+    """
+    lower_rank, upper_rank = _ci_ranks(sample_means.size, confidence_level)
+    return min(sample_means[lower_rank], mean), max(sample_means[upper_rank], mean)
+
+
+# A partir deste tamanho de amostra o IC da média usa a aproximação normal;
+# abaixo dele usa o t de Student, que cobre as 3–10 repetições típicas dos
+# experimentos sem o custo do bootstrap
+_NORMAL_CI_MIN_SAMPLES = 30
+
+
+def _normal_ci(mean, std, n, confidence_level=_CONFIDENCE_LEVEL):
+    """Intervalo de confiança normal da média: mean ± z·std/√n."""
+    from scipy.stats import norm
+    
+    half_width = norm.ppf(0.5 + confidence_level / 2) * std / np.sqrt(n)
+    return mean - half_width, mean + half_width
+
+
+def _t_ci(mean, std, n, confidence_level=_CONFIDENCE_LEVEL):
+    """Intervalo de confiança t de Student da média: mean ± t(n-1)·std/√n."""
+    from scipy.stats import t
+    
+    half_width = t.ppf(0.5 + confidence_level / 2, n - 1) * std / np.sqrt(n)
+    return mean - half_width, mean + half_width
+
+
+def _mean_ci(mean, std, n, confidence_level=_CONFIDENCE_LEVEL):
+    """
+    Intervalo de confiança da média em forma fechada: t de Student abaixo de
+    `_NORMAL_CI_MIN_SAMPLES` observações, normal a partir daí.
+    """
+    ci = _normal_ci if n >= _NORMAL_CI_MIN_SAMPLES else _t_ci
+    return ci(mean, std, n, confidence_level)
+
+
+def _fisher_ci(r, n, confidence_level=_CONFIDENCE_LEVEL):
+    """
+    Intervalo de confiança da correlação de Pearson pela transformação z de
+    Fisher: tanh(atanh(r) ± z/√(n-3)). Exige n > 3.
+    """
+    from scipy.stats import norm
+    
+    half_width = norm.ppf(0.5 + confidence_level / 2) / np.sqrt(n - 3)
+    z = np.arctanh(r)
+    return np.tanh(z - half_width), np.tanh(z + half_width)
+
+
+# Cache em disco das distribuições bootstrap (ENERGY_ANALYSIS_CACHE sobrescreve)
+DEFAULT_CACHE_DIR = Path(os.environ.get('ENERGY_ANALYSIS_CACHE',
+                                        Path.home() / '.cache' / 'energy_analysis'))
+# Incrementar ao mudar o kernel do bootstrap, invalidando entradas antigas
+_CACHE_VERSION = 9
+
+
+def _bootstrap_cache_path(cache_dir, energy_data, time_data, seed, n_resamples):
+    """
+    Caminho do cache de uma célula, chaveado pelo hash dos dados e do backend
+    (Numba ou NumPy), que sorteiam reamostragens diferentes.
+    
+    Só o kernel Numba usa a semente da célula; no NumPy a matriz de pesos
+    depende apenas de n, e a semente fica fora da chave.
+    """
+    if _boot_stats is not None:
+        backend = ('numba', seed.entropy, seed.spawn_key)
+    else:
+        backend = ('numpy',)
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(energy_data).tobytes())
+    digest.update(np.ascontiguousarray(time_data).tobytes())
+    digest.update(repr((_CACHE_VERSION, backend, n_resamples)).encode())
+    return Path(cache_dir) / f"{digest.hexdigest()}.npz"
+
+
+def _cell_sample_means(energy_data, time_data, seed, cache_dir=None,
+                       n_resamples=DEFAULT_N_RESAMPLES):
+    """
+    Distribuições bootstrap da média de energia, tempo e EDP.
+    
+    Cada distribuição é particionada nas posições do IC de 95% em O(B), sem
+    ordenação completa.
+    
+    Com `cache_dir`, reaproveita o resultado salvo em disco quando os dados e a
+    semente não mudaram; falhas de leitura ou escrita do cache são ignoradas.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = _bootstrap_cache_path(cache_dir, energy_data, time_data, seed, n_resamples)
+        try:
+            with np.load(cache_path) as cached:
+                return {metric: cached[metric] for metric in ('energy', 'time', 'edp')}
+        except (OSError, KeyError, ValueError):
+            pass
+    
+    energy_means, time_means, edp_means = _bootstrap_sample_means(
+        energy_data, time_data, seed, n_resamples)
+    sample_means = {'energy': energy_means, 'time': time_means, 'edp': edp_means}
+    for means in sample_means.values():
+        means.partition(_ci_ranks(means.size))
+    
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Escreve em arquivo temporário e renomeia: leitores nunca veem meio arquivo
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **sample_means)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
+    return sample_means
+
+
+def _analyze_cell(energy_data, time_data, energy_stats, time_stats, edp_stats, correlation,
+                  p_value, seed, cache_dir=None, force_bootstrap=False, n_resamples=DEFAULT_N_RESAMPLES):
+    """
+    Calcula as estatísticas de uma célula (algoritmo, frequência).
+    
+    Fica no nível do módulo e não imprime nada para poder ser executada em
+    processos separados.
+    
+    Args:
+        energy_data: Array com as medições de energia (J)
+        time_data: Array com as medições de tempo (ms)
+        energy_stats: Média e desvio padrão da energia, já agregados
+        time_stats: Média e desvio padrão do tempo, já agregados
+        edp_stats: Média e desvio padrão do EDP, já agregados
+        correlation: Correlação energia-tempo, já calculada (`_pearson_from_sums`)
+        p_value: p-valor da correlação, já calculado (`_pearson_p_value`)
+        seed: SeedSequence própria da célula para o bootstrap
+        cache_dir: Diretório do cache do bootstrap (None desativa)
+        force_bootstrap: Usa bootstrap no lugar dos ICs t/normal da média
+        n_resamples: Número de reamostragens bootstrap
+    """
+    # Estatísticas básicas
+    n_samples = len(energy_data)
+    
+    # Energia
+    energy_mean, energy_std = energy_stats
+    
+    # Tempo  
+    time_mean, time_std = time_stats
+    
+    # Energy-Delay Product (EDP) - Métrica de eficiência energética
+    # EDP = Energy × Time (lower is better)
+    edp_mean, edp_std = edp_stats
+    
+    # Para uma única amostra, não calculamos desvio padrão ou IC
+    if n_samples == 1:
+        return {
+            'n_samples': n_samples,
+            'energy': {
+                'mean': energy_mean,
+                'std': None,
+                'ci_lower': None,
+                'ci_upper': None,
+                'sample_means': None
+            },
+            'time': {
+                'mean': time_mean,
+                'std': None,
+                'ci_lower': None,
+                'ci_upper': None,
+                'sample_means': None
+            },
+            'edp': {
+                'mean': edp_mean,
+                'std': None,
+                'ci_lower': None,
+                'ci_upper': None,
+                'sample_means': None
+            },
+            'correlation': {
+                'value': None,
+                'p_value': None,
+                'ci_lower': None,
+                'ci_upper': None
+            }
+        }
+    else:
+        # Múltiplas amostras: calcula estatísticas completas
+        # Correlação
+        p_value = float(p_value)
+        # IC da correlação em forma fechada (z de Fisher), sem bootstrap
+        correlation_ci = _fisher_ci(correlation, n_samples) if n_samples > 3 else (None, None)
+        
+        if not force_bootstrap:
+            # IC t (amostras pequenas) ou normal (TLC) direto da média e do
+            # desvio padrão, sem reamostrar
+            sample_means = {'energy': None, 'time': None, 'edp': None}
+            
+            energy_ci = _mean_ci(energy_mean, energy_std, n_samples)
+            time_ci = _mean_ci(time_mean, time_std, n_samples)
+            edp_ci = _mean_ci(edp_mean, edp_std, n_samples)
+        else:
+            # Intervalos de confiança bootstrap (95%)
+            sample_means = _cell_sample_means(energy_data, time_data, seed, cache_dir, n_resamples)
+            
+            energy_ci = _percentile_ci(sample_means['energy'], energy_mean)
+            time_ci = _percentile_ci(sample_means['time'], time_mean)
+            edp_ci = _percentile_ci(sample_means['edp'], edp_mean)
+        
+        # Armazena resultados
+        return {
+            'n_samples': n_samples,
+            'energy': {
+                'mean': energy_mean,
+                'std': energy_std,
+                'ci_lower': energy_ci[0],
+                'ci_upper': energy_ci[1],
+                'sample_means': sample_means['energy']
+            },
+            'time': {
+                'mean': time_mean,
+                'std': time_std,
+                'ci_lower': time_ci[0],
+                'ci_upper': time_ci[1],
+                'sample_means': sample_means['time']
+            },
+            'edp': {
+                'mean': edp_mean,
+                'std': edp_std,
+                'ci_lower': edp_ci[0],
+                'ci_upper': edp_ci[1],
+                'sample_means': sample_means['edp']
+            },
+            'correlation': {
+                'value': correlation,
+                'p_value': p_value,
+                'ci_lower': correlation_ci[0],
+                'ci_upper': correlation_ci[1]
+            }
+        }
+
+
+def _render_energy_plots(plots):
+    """
+    Renderiza os gráficos de energia por frequência de uma lista de algoritmos.
+    
+    Fica no nível do módulo para poder ser executada em processos separados.
+    
+    Args:
+        plots: Tuplas (nome de exibição, frequências, energias médias, limites
+            inferior e superior do IC, cor, arquivo de saída); ICs ausentes
+            são NaN
+    """
+    plt = _pyplot()
+    
+    # Uma única figura é reaproveitada por todos os algoritmos: criar a
+    # Figure e seus eixos a cada gráfico custa mais que limpar o Axes. O
+    # layout restrito ajusta as margens no próprio desenho, sem a passada
+    # extra do tight_layout a cada algoritmo
+    fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
+    
+    for algo_name, frequencies, energies, ci_lowers, ci_uppers, color, output_file in plots:
+        ax.cla()
+        
+        # Verifica se TODAS as frequências têm intervalos de confiança
+        has_ci = not (np.isnan(ci_lowers).any() or np.isnan(ci_uppers).any())
+        
+        if has_ci:
+            # Todas as frequências têm intervalos de confiança
+            # Calcula erros para errorbar (diferenças da média)
+            yerr_lower = energies - ci_lowers
+            yerr_upper = ci_uppers - energies
+            yerr = [yerr_lower, yerr_upper]
+            
+            # Cria gráfico de barras com intervalos de confiança
+            bars = ax.bar(range(len(frequencies)), energies, 
+                         color=color, alpha=0.8, 
+                         yerr=yerr, capsize=8,
+                         error_kw={'ecolor': 'black', 'alpha': 0.8})
+            
+            # Adiciona valores exatos nas barras
+            for j, (bar, energy_val) in enumerate(zip(bars, energies)):
+                height = bar.get_height()
+                text_y = height + yerr[1][j] + (max(energies) * 0.05)
+                ax.text(bar.get_x() + bar.get_width()/2., text_y,
+                       f'{energy_val:.4f} J', ha='center', va='bottom', 
+                       fontsize=10, fontweight='bold')
+        else:
+            # Sem intervalos de confiança ou ICs parciais - apenas barras simples
+            bars = ax.bar(range(len(frequencies)), energies, 
+                         color=color, alpha=0.8)
+            
+            # Adiciona valores exatos nas barras
+            for j, (bar, energy_val) in enumerate(zip(bars, energies)):
+                height = bar.get_height()
+                text_y = height + (max(energies) * 0.05)
+                ax.text(bar.get_x() + bar.get_width()/2., text_y,
+                       f'{energy_val:.4f} J', ha='center', va='bottom', 
+                       fontsize=10, fontweight='bold')
+        
+        # Configurações do gráfico
+        ax.set_title(f'{algo_name} - Consumo Energético por Frequência CPU', 
+                    fontsize=14, fontweight='bold', pad=20)
+        ax.set_xlabel('Frequência CPU (MHz)', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Consumo de Energia (J)', fontsize=12, fontweight='bold')
+        
+        # Configurações dos ticks
+        ax.set_xticks(range(len(frequencies)))
+        ax.set_xticklabels([f'{freq}' for freq in frequencies], fontsize=11)
+        ax.grid(True, alpha=0.3, axis='y', linestyle='--')
+        
+        # Salva com nome do algoritmo (150 dpi bastam para visualização
+        # em tela e renderizam um quarto dos pixels de 300 dpi). O layout
+        # restrito já encaixa títulos e rótulos na figura: sem
+        # bbox_inches='tight' o savefig não precisa de um desenho extra só
+        # para medir o recorte
+        fig.savefig(output_file, dpi=150, pil_kwargs=_PNG_PIL_KWARGS)
+    
+    plt.close(fig)
+
 
 class EnergyTimeAnalysis:
     """Classe para apresentação de dados de energia e tempo por frequência."""
     
-    def __init__(self, csv_path_or_pattern: str):
+    def __init__(self, csv_path_or_pattern: str, n_jobs: int = 1,
+                 cache_dir=DEFAULT_CACHE_DIR, force_bootstrap: bool = False,
+                 n_resamples: int = DEFAULT_N_RESAMPLES):
         """
         Inicializa a análise com arquivo(s) CSV.
         
         Args:
             csv_path_or_pattern: Caminho para arquivo CSV ou padrão para múltiplos arquivos
+            n_jobs: Processos usados nas estatísticas por célula e nos gráficos
+                individuais (<= 0 usa todos os núcleos)
+            cache_dir: Diretório do cache das distribuições bootstrap (None desativa)
+            force_bootstrap: Usa bootstrap no lugar dos ICs t/normal da média
+            n_resamples: Reamostragens bootstrap por célula
         """
         self.csv_path_or_pattern = csv_path_or_pattern
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.force_bootstrap = force_bootstrap
+        if n_resamples < 1:
+            raise ValueError(f"n_resamples deve ser >= 1, recebido: {n_resamples}")
+        self.n_resamples = n_resamples
         self.data = None
+        self.algos = None
+        self.algo_names = None
+        self.frequencies = None
         self.load_data()
     
     def extract_frequency_from_filename(self, filename):
         """Extrai a frequência do processador do nome do arquivo."""
         # Busca por padrão como "500mhz", "1500mhz", etc.
-        match = re.search(r'(\d+)mhz', filename.lower())
-        if match:
-            return int(match.group(1))
-        return None
+        return _frequency_from_filename(filename)
     
     def load_data(self):
         """Carrega os dados de um ou múltiplos CSVs."""
@@ -49,7 +689,7 @@ class EnergyTimeAnalysis:
             # Verifica se é um arquivo único
             if os.path.isfile(self.csv_path_or_pattern):
                 # Arquivo único
-                self.data = pd.read_csv(self.csv_path_or_pattern)
+                self.data = _read_csv(self.csv_path_or_pattern)
                 print(f"✓ Arquivo carregado: {self.csv_path_or_pattern}")
                 
                 # Adiciona coluna com nome do arquivo para identificação
@@ -64,10 +704,10 @@ class EnergyTimeAnalysis:
                     # Formato antigo: extrai do nome do arquivo
                     frequency = self.extract_frequency_from_filename(os.path.basename(self.csv_path_or_pattern))
                     if frequency is not None:
-                        self.data['cpu_frequency_mhz'] = frequency
+                        self.data['cpu_frequency_mhz'] = np.int32(frequency)
                         print(f"✓ Formato antigo detectado (CPU: {frequency} MHz do nome do arquivo)")
                     else:
-                        self.data['cpu_frequency_mhz'] = 'Não identificado'
+                        self.data['cpu_frequency_mhz'] = pd.NA
                         print(f"✓ Aviso: frequência CPU não encontrada")
             else:
                 # Múltiplos arquivos - primeiro tenta como diretório
@@ -83,7 +723,7 @@ class EnergyTimeAnalysis:
                 # Carrega e combina todos os arquivos
                 dataframes = []
                 for file in sorted(files):
-                    df = pd.read_csv(file)
+                    df = _read_csv(file)
                     filename = os.path.basename(file)
                     
                     # Adiciona coluna com nome do arquivo para identificação
@@ -98,10 +738,11 @@ class EnergyTimeAnalysis:
                         # Formato antigo: extrai frequência do nome do arquivo
                         frequency = self.extract_frequency_from_filename(filename)
                         if frequency is not None:
-                            df['cpu_frequency_mhz'] = frequency
+                            # Inteiro de 32 bits, como a coluna freq_mhz do formato novo
+                            df['cpu_frequency_mhz'] = np.int32(frequency)
                             print(f"✓ Carregado: {filename} (CPU: {frequency} MHz)")
                         else:
-                            df['cpu_frequency_mhz'] = 'Não identificado'
+                            df['cpu_frequency_mhz'] = pd.NA
                             print(f"✓ Carregado: {filename} (CPU: frequência não identificada)")
                     
                     dataframes.append(df)
@@ -109,146 +750,154 @@ class EnergyTimeAnalysis:
                 if not dataframes:
                     raise ValueError("Nenhum arquivo CSV válido encontrado")
                 
-                self.data = pd.concat(dataframes, ignore_index=True)
+                # Com um único arquivo o concat só copiaria o DataFrame inteiro
+                if len(dataframes) == 1:
+                    self.data = dataframes[0]
+                else:
+                    self.data = pd.concat(dataframes, ignore_index=True)
+            
+            # O concat de categorias distintas perde o dtype; as categorias
+            # resultantes já ficam ordenadas e sem repetição
+            if 'algo' in self.data.columns:
+                self.data['algo'] = self.data['algo'].astype('category')
+                # Lista de algoritmos memorizada para os relatórios
+                self.algos = self.data['algo'].cat.categories.tolist()
+                # Nomes de exibição ("merge_sort" -> "Merge Sort") usados pelas
+                # análises e gráficos, formatados uma única vez
+                self.algo_names = {algo: algo.replace('_', ' ').title() for algo in self.algos}
+            
+            # Frequência como inteiro anulável: arquivos sem frequência
+            # identificada ficam com NA, e filtros e groupby comparam inteiros
+            # em vez de misturar números e texto em uma coluna object
+            self.data['cpu_frequency_mhz'] = self.data['cpu_frequency_mhz'].astype('Int32')
             
             print(f"✓ Total de registros: {len(self.data)}")
-            print(f"✓ Algoritmos: {', '.join(sorted(self.data['algo'].unique()))}")
+            print(f"✓ Algoritmos: {', '.join(self.algos)}")
             
             # Exibe informação sobre tamanhos se disponível
             if 'size' in self.data.columns:
                 print(f"✓ Tamanhos de entrada detectados: {sorted(self.data['size'].unique())}")
             
-            frequencies = sorted([f for f in self.data['cpu_frequency_mhz'].unique() if f != 'Não identificado'])
-            if frequencies:
-                print(f"✓ Frequências CPU: {', '.join(map(str, frequencies))} MHz")
+            # Frequências identificadas, memorizadas para os relatórios
+            self.frequencies = sorted(self.data['cpu_frequency_mhz'].dropna().unique().tolist())
+            if self.frequencies:
+                print(f"✓ Frequências CPU: {', '.join(map(str, self.frequencies))} MHz")
             
             # Verifica se tem as colunas necessárias
             required_columns = ['algo', 'joules', 'time_ms']
             missing_columns = [col for col in required_columns if col not in self.data.columns]
             if missing_columns:
                 raise ValueError(f"Colunas obrigatórias não encontradas: {missing_columns}")
+            
+            # Energy-Delay Product calculado uma vez para todos os registros,
+            # em vez de um produto por célula a cada análise
+            self.data['edp'] = self.data['joules'].to_numpy() * self.data['time_ms'].to_numpy()
                 
         except Exception as e:
             raise ValueError(f"Erro ao carregar dados: {e}")
     
     def analyze(self):
         """Apresenta métricas organizadas por algoritmo e frequência CPU."""
-        print("\n" + "="*80)
-        print("DADOS DE CONSUMO DE ENERGIA E TEMPO POR FREQUÊNCIA CPU")
-        print("="*80)
+        results = self._compute_results()
+        self._print_results(results)
+        return results
+    
+    def _compute_results(self):
+        """
+        Calcula as métricas de cada (algoritmo, frequência), sem I/O.
         
+        O dicionário retornado já sai ordenado por algoritmo e, dentro de cada
+        algoritmo, por frequência; relatórios e gráficos iteram nessa ordem de
+        inserção sem reordenar as chaves.
+        """
         results = {}
         
-        # Agrupa por algoritmo e frequência
-        for algo in sorted(self.data['algo'].unique()):
-            results[algo] = {}
-            
-            frequencies = sorted([f for f in self.data['cpu_frequency_mhz'].unique() if f != 'Não identificado'])
-            
-            for freq in frequencies:
-                subset = self.data[(self.data['algo'] == algo) & (self.data['cpu_frequency_mhz'] == freq)]
-                
-                if len(subset) == 0:
-                    continue
-                    
-                energy_data = subset['joules'].values
-                time_data = subset['time_ms'].values
-                
-                # Estatísticas básicas
-                n_samples = len(energy_data)
-                
-                # Energia
-                energy_mean = np.mean(energy_data)
-                
-                # Tempo  
-                time_mean = np.mean(time_data)
-                
-                # Energy-Delay Product (EDP) - Métrica de eficiência energética
-                # EDP = Energy × Time (lower is better)
-                edp_data = energy_data * time_data
-                edp_mean = np.mean(edp_data)
-                
-                # Para uma única amostra, não calculamos desvio padrão ou IC
-                if n_samples == 1:
-                    results[algo][freq] = {
-                        'n_samples': n_samples,
-                        'energy': {
-                            'mean': energy_mean,
-                            'std': None,
-                            'ci_lower': None,
-                            'ci_upper': None
-                        },
-                        'time': {
-                            'mean': time_mean,
-                            'std': None,
-                            'ci_lower': None,
-                            'ci_upper': None
-                        },
-                        'edp': {
-                            'mean': edp_mean,
-                            'std': None,
-                            'ci_lower': None,
-                            'ci_upper': None
-                        },
-                        'correlation': {
-                            'value': None,
-                            'p_value': None
-                        }
-                    }
-                else:
-                    # Múltiplas amostras: calcula estatísticas completas
-                    energy_std = np.std(energy_data, ddof=1)
-                    time_std = np.std(time_data, ddof=1)
-                    edp_std = np.std(edp_data, ddof=1)
-                    
-                    # Correlação
-                    correlation, p_value = pearsonr(energy_data, time_data)
-                    
-                    # Intervalos de confiança bootstrap (95%)
-                    rng = np.random.default_rng(42)
-                    
-                    energy_bootstrap = bootstrap((energy_data,), np.mean, n_resamples=10000,
-                                               confidence_level=0.95, random_state=rng)
-                    time_bootstrap = bootstrap((time_data,), np.mean, n_resamples=10000,
-                                             confidence_level=0.95, random_state=rng)
-                    edp_bootstrap = bootstrap((edp_data,), np.mean, n_resamples=10000,
-                                           confidence_level=0.95, random_state=rng)
-                    
-                    # Armazena resultados
-                    results[algo][freq] = {
-                        'n_samples': n_samples,
-                        'energy': {
-                            'mean': energy_mean,
-                            'std': energy_std,
-                            'ci_lower': energy_bootstrap.confidence_interval.low,
-                            'ci_upper': energy_bootstrap.confidence_interval.high
-                        },
-                        'time': {
-                            'mean': time_mean,
-                            'std': time_std,
-                            'ci_lower': time_bootstrap.confidence_interval.low,
-                            'ci_upper': time_bootstrap.confidence_interval.high
-                        },
-                        'edp': {
-                            'mean': edp_mean,
-                            'std': edp_std,
-                            'ci_lower': edp_bootstrap.confidence_interval.low,
-                            'ci_upper': edp_bootstrap.confidence_interval.high
-                        },
-                        'correlation': {
-                            'value': correlation,
-                            'p_value': p_value
-                        }
-                    }
+        # Agrupa por algoritmo e frequência em uma única passada sobre os dados;
+        # os grupos somam x e (x − x̄)² de cada métrica (ver `_moments_mean_std`)
+        # As somas agrupadas pulariam NaN enquanto n conta todas as linhas:
+        # medições em branco saem antes, e n é o mesmo para todas as métricas
+        identified = self.data[self.data['cpu_frequency_mhz'].notna()
+                               & self.data['joules'].notna()
+                               & self.data['time_ms'].notna()]
+        values = identified[_MOMENT_COLUMNS]
+        keys = [identified['algo'], identified['cpu_frequency_mhz']]
+        # Desvios em relação à média do grupo: os quadrados e o produto
+        # cruzado somados a partir deles não sofrem cancelamento numérico
+        deviations = values - values.groupby(keys, observed=True).transform('mean')
+        moments = pd.concat([values, (deviations * deviations).add_suffix('_sq'),
+                             (deviations['joules'] * deviations['time_ms']).rename('cross')],
+                            axis=1)
+        grouped = moments.groupby(keys, sort=True, observed=True)
+        
+        # Cada célula é lida das colunas contíguas pelas posições do grupo,
+        # sem montar um DataFrame intermediário por célula
+        energy_column = identified['joules'].to_numpy(copy=False)
+        time_column = identified['time_ms'].to_numpy(copy=False)
+        # Células de mesmo tamanho ficam adjacentes para reaproveitarem a
+        # matriz de pesos do bootstrap (ver `_bootstrap_weights`)
+        cells = {key: (energy_column[idx], time_column[idx])
+                 for key, idx in sorted(grouped.indices.items(),
+                                        key=lambda item: (item[1].size, item[0]))}
+        energies = [energy_data for energy_data, _ in cells.values()]
+        times = [time_data for _, time_data in cells.values()]
+        
+        # Média e desvio de energia, tempo e EDP de todas as células a partir
+        # de uma única soma agrupada, na mesma ordem de `cells`
+        sums = grouped.sum().loc[list(cells)]
+        n = np.array([energy_data.size for energy_data in energies])
+        energy_stats, time_stats, edp_stats = (
+            list(zip(*_moments_mean_std(n, sums[col].to_numpy(), sums[f'{col}_sq'].to_numpy())))
+            for col in _MOMENT_COLUMNS)
+        # Correlação energia-tempo de todas as células pelas mesmas somas
+        correlations = _pearson_from_sums(
+            n, sums['joules'].to_numpy() / n, sums['time_ms'].to_numpy() / n,
+            sums['cross'].to_numpy(), sums['joules_sq'].to_numpy(), sums['time_ms_sq'].to_numpy())
+        # p-valores de todas as células em uma única chamada vetorizada
+        p_values = _pearson_p_value(correlations, n)
+        
+        # Um fluxo aleatório independente e determinístico por célula, derivado
+        # de (algoritmo, frequência) e não da posição da célula: incluir outros
+        # arquivos ou algoritmos não muda a semente (nem o cache) das demais
+        seeds = [np.random.SeedSequence(42, spawn_key=(zlib.crc32(str(algo).encode()), int(freq)))
+                 for algo, freq in cells]
+        
+        analyze_cell = partial(_analyze_cell, cache_dir=self.cache_dir,
+                               force_bootstrap=self.force_bootstrap,
+                               n_resamples=self.n_resamples)
+        
+        # As células são independentes: com n_jobs > 1 rodam em paralelo
+        if self.n_jobs != 1 and len(cells) > 1:
+            max_workers = self.n_jobs if self.n_jobs > 0 else os.cpu_count()
+            # Um bloco contíguo de células por processo: como `cells` está
+            # ordenado por tamanho, cada processo vê os tamanhos agrupados e
+            # reaproveita a matriz memorizada de `_bootstrap_weights`, o que a
+            # distribuição alternada do chunksize padrão (1) não garante
+            chunksize = -(-len(cells) // max_workers)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                cell_results = list(executor.map(analyze_cell, energies, times, energy_stats,
+                                                 time_stats, edp_stats, correlations, p_values, seeds,
+                                                 chunksize=chunksize))
+        else:
+            cell_results = list(map(analyze_cell, energies, times, energy_stats,
+                                    time_stats, edp_stats, correlations, p_values, seeds))
+        
+        for (algo, freq), cell_result in sorted(zip(cells, cell_results), key=lambda item: item[0]):
+            results.setdefault(algo, {})[freq] = cell_result
+        
+        return results
+    
+    def _print_results(self, results):
+        """Imprime as métricas calculadas por `_compute_results`."""
+        print("\n" + "="*80)
+        print("DADOS DE CONSUMO DE ENERGIA E TEMPO POR FREQUÊNCIA CPU")
+        print("="*80)
         
         # Apresenta dados organizados
-        for algo in sorted(results.keys()):
+        for algo, algo_results in results.items():
             print(f"\n{algo.upper().replace('_', ' ')}")
             print("=" * 60)
             
-            for freq in sorted(results[algo].keys()):
-                data = results[algo][freq]
-                
+            for freq, data in algo_results.items():
                 print(f"\nCPU: {freq} MHz")
                 print("-" * 40)
                 print(f"Observações: {data['n_samples']}")
@@ -274,123 +923,168 @@ class EnergyTimeAnalysis:
                 
                 if data['correlation']['value'] is not None:
                     print(f"\nCorrelação Energia-Tempo: {data['correlation']['value']:.3f} (p={data['correlation']['p_value']:.6f})")
+                    if data['correlation']['ci_lower'] is not None:
+                        print(f"  IC 95%: [{data['correlation']['ci_lower']:.3f}, {data['correlation']['ci_upper']:.3f}]")
                 else:
                     print(f"\nCorrelação Energia-Tempo: N/A (amostra única)")
-        
-        return results
     
     
+    def ci(self, results, algo, freq, metric='energy', level=_CONFIDENCE_LEVEL):
+        """
+        Intervalo de confiança bootstrap em outro nível (ex.: 0.90, 0.99).
+        
+        Reaproveita a distribuição guardada por `analyze`, sem refazer o
+        bootstrap. Ela vem particionada só para o nível padrão: a primeira
+        consulta em outro nível a ordena no lugar e marca a célula
+        ('sample_means_sorted'), e as seguintes ficam O(1). Células que
+        usaram o IC t ou normal são recalculadas pela mesma aproximação.
+        Retorna None para células com amostra única.
+        
+        Args:
+            metric: 'energy', 'time' ou 'edp'; o IC da correlação já vem
+                pronto em results[algo][freq]['correlation']
+        """
+        if metric not in ('energy', 'time', 'edp'):
+            raise ValueError(f"Métrica sem IC da média: {metric!r} (use 'energy', 'time' ou 'edp')")
+        
+        stats = results[algo][freq][metric]
+        sample_means = stats['sample_means']
+        if sample_means is None:
+            if stats['std'] is None:
+                return None
+            return _mean_ci(stats['mean'], stats['std'], results[algo][freq]['n_samples'], level)
+        if level != _CONFIDENCE_LEVEL and not stats.get('sample_means_sorted'):
+            sample_means.sort()
+            stats['sample_means_sorted'] = True
+        return _percentile_ci(sample_means, stats['mean'], level)
+    
     def generate_frequency_report(self, results, output_file='energy_frequency_report.txt'):
         """Gera relatório organizado por frequência CPU."""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("RELATÓRIO - DADOS POR FREQUÊNCIA CPU\n")
-            f.write("=" * 45 + "\n\n")
-            
-            # Informações gerais
-            f.write("DADOS ANALISADOS\n")
-            f.write("-" * 20 + "\n")
-            f.write(f"Fonte: {self.csv_path_or_pattern}\n")
-            f.write(f"Total de registros: {len(self.data)}\n")
-            f.write(f"Algoritmos: {', '.join(sorted(self.data['algo'].unique()))}\n")
-            frequencies = sorted([f for f in self.data['cpu_frequency_mhz'].unique() if f != 'Não identificado'])
-            if frequencies:
-                f.write(f"Frequências CPU: {', '.join(map(str, frequencies))} MHz\n\n")
+        parts = []
+        parts.append("RELATÓRIO - DADOS POR FREQUÊNCIA CPU\n")
+        parts.append("=" * 45 + "\n\n")
+        
+        # Informações gerais
+        parts.append("DADOS ANALISADOS\n")
+        parts.append("-" * 20 + "\n")
+        parts.append(f"Fonte: {self.csv_path_or_pattern}\n")
+        parts.append(f"Total de registros: {len(self.data)}\n")
+        parts.append(f"Algoritmos: {', '.join(self.algos)}\n")
+        if self.frequencies:
+            parts.append(f"Frequências CPU: {', '.join(map(str, self.frequencies))} MHz\n\n")
+        
+        # Dados por algoritmo e frequência
+        for algo, algo_results in results.items():
+            parts.append(f"\n{algo.upper().replace('_', ' ')}\n")
+            parts.append("=" * 50 + "\n")
             
-            # Dados por algoritmo e frequência
-            for algo in sorted(results.keys()):
-                f.write(f"\n{algo.upper().replace('_', ' ')}\n")
-                f.write("=" * 50 + "\n")
+            for freq, data in algo_results.items():
+                parts.append(f"\nCPU: {freq} MHz\n")
+                parts.append("-" * 30 + "\n")
+                parts.append(f"Observações: {data['n_samples']}\n\n")
                 
-                for freq in sorted(results[algo].keys()):
-                    data = results[algo][freq]
-                    
-                    f.write(f"\nCPU: {freq} MHz\n")
-                    f.write("-" * 30 + "\n")
-                    f.write(f"Observações: {data['n_samples']}\n\n")
-                    
-                    f.write(f"ENERGIA:\n")
-                    f.write(f"  Valor: {data['energy']['mean']:.6f} J\n")
-                    if data['energy']['std'] is not None:
-                        f.write(f"  Desvio: {data['energy']['std']:.6f} J\n")
-                        f.write(f"  IC 95%: [{data['energy']['ci_lower']:.6f}, {data['energy']['ci_upper']:.6f}] J\n")
-                    f.write("\n")
-                    
-                    f.write(f"TEMPO:\n")
-                    f.write(f"  Valor: {data['time']['mean']:.3f} ms\n")
-                    if data['time']['std'] is not None:
-                        f.write(f"  Desvio: {data['time']['std']:.3f} ms\n")
-                        f.write(f"  IC 95%: [{data['time']['ci_lower']:.3f}, {data['time']['ci_upper']:.3f}] ms\n")
-                    f.write("\n")
-                    
-                    f.write(f"EDP (ENERGY-DELAY PRODUCT):\n")
-                    f.write(f"  Valor: {data['edp']['mean']:.6f} J·ms\n")
-                    if data['edp']['std'] is not None:
-                        f.write(f"  Desvio: {data['edp']['std']:.6f} J·ms\n")
-                        f.write(f"  IC 95%: [{data['edp']['ci_lower']:.6f}, {data['edp']['ci_upper']:.6f}] J·ms\n")
-                    f.write("  (Menor EDP = Melhor eficiência energética)\n\n")
-                    
-                    if data['correlation']['value'] is not None:
-                        f.write(f"CORRELAÇÃO ENERGIA-TEMPO: {data['correlation']['value']:.3f} ")
-                        f.write(f"(p={data['correlation']['p_value']:.6f})\n")
-                    else:
-                        f.write(f"CORRELAÇÃO ENERGIA-TEMPO: N/A (amostra única)\n")
+                parts.append(f"ENERGIA:\n")
+                parts.append(f"  Valor: {data['energy']['mean']:.6f} J\n")
+                if data['energy']['std'] is not None:
+                    parts.append(f"  Desvio: {data['energy']['std']:.6f} J\n")
+                    parts.append(f"  IC 95%: [{data['energy']['ci_lower']:.6f}, {data['energy']['ci_upper']:.6f}] J\n")
+                parts.append("\n")
+                
+                parts.append(f"TEMPO:\n")
+                parts.append(f"  Valor: {data['time']['mean']:.3f} ms\n")
+                if data['time']['std'] is not None:
+                    parts.append(f"  Desvio: {data['time']['std']:.3f} ms\n")
+                    parts.append(f"  IC 95%: [{data['time']['ci_lower']:.3f}, {data['time']['ci_upper']:.3f}] ms\n")
+                parts.append("\n")
+                
+                parts.append(f"EDP (ENERGY-DELAY PRODUCT):\n")
+                parts.append(f"  Valor: {data['edp']['mean']:.6f} J·ms\n")
+                if data['edp']['std'] is not None:
+                    parts.append(f"  Desvio: {data['edp']['std']:.6f} J·ms\n")
+                    parts.append(f"  IC 95%: [{data['edp']['ci_lower']:.6f}, {data['edp']['ci_upper']:.6f}] J·ms\n")
+                parts.append("  (Menor EDP = Melhor eficiência energética)\n\n")
+                
+                if data['correlation']['value'] is not None:
+                    parts.append(f"CORRELAÇÃO ENERGIA-TEMPO: {data['correlation']['value']:.3f} ")
+                    parts.append(f"(p={data['correlation']['p_value']:.6f})\n")
+                    if data['correlation']['ci_lower'] is not None:
+                        parts.append(f"  IC 95%: [{data['correlation']['ci_lower']:.3f}, {data['correlation']['ci_upper']:.3f}]\n")
+                else:
+                    parts.append(f"CORRELAÇÃO ENERGIA-TEMPO: N/A (amostra única)\n")
+        
+        # Tabela resumo por frequência
+        parts.append(f"\n\nTABELA RESUMO POR FREQUÊNCIA\n")
+        parts.append("=" * 40 + "\n")
+        
+        # Cabeçalho
+        parts.append(f"\n{'Algoritmo':<15} {'CPU(MHz)':<10} {'Energia(J)':<15} {'Tempo(ms)':<12}\n")
+        parts.append("-" * 55 + "\n")
+        
+        # Uma linha formatada por célula e um bloco por algoritmo
+        for algo, algo_results in results.items():
+            parts.extend(f"{algo:<15} {freq:<10} {data['energy']['mean']:<15.6f} "
+                         f"{data['time']['mean']:<12.3f}\n"
+                         for freq, data in algo_results.items())
+            parts.append("\n")
+        
+        # Monta o relatório em memória e grava tudo com uma única escrita
+        Path(output_file).write_text(''.join(parts), encoding='utf-8')
+    
+    def _results_frame(self, results):
+        """
+        Tabela com uma linha por (algoritmo, frequência) e as colunas do CSV
+        consolidado, na ordem de `results`.
+        
+        É remontada a cada chamada (menos de 1 ms para centenas de células),
+        então reflete sempre o conteúdo atual de `results`.
+        """
+        cells = [data for algo_results in results.values() for data in algo_results.values()]
+        
+        def column(metric, field):
+            # Métricas ausentes (amostra única) viram NaN, gravado como campo vazio
+            values = (data[metric][field] for data in cells)
+            return np.fromiter((np.nan if value is None else value for value in values),
+                               dtype=np.float64, count=len(cells))
+        
+        # Cada coluna é montada inteira de uma vez, sem um dict por linha
+        columns = {
+            'algoritmo': [algo for algo, algo_results in results.items() for _ in algo_results],
+            'cpu_frequency_mhz': [freq for algo_results in results.values() for freq in algo_results],
+            'n_observacoes': np.fromiter((data['n_samples'] for data in cells),
+                                         dtype=np.int64, count=len(cells)),
+            
+            # Energia
+            'energia_valor_J': column('energy', 'mean'),
+            'energia_desvio_J': column('energy', 'std'),
+            'energia_ic95_lower_J': column('energy', 'ci_lower'),
+            'energia_ic95_upper_J': column('energy', 'ci_upper'),
             
-            # Tabela resumo por frequência
-            f.write(f"\n\nTABELA RESUMO POR FREQUÊNCIA\n")
-            f.write("=" * 40 + "\n")
+            # Tempo
+            'tempo_valor_ms': column('time', 'mean'),
+            'tempo_desvio_ms': column('time', 'std'),
+            'tempo_ic95_lower_ms': column('time', 'ci_lower'),
+            'tempo_ic95_upper_ms': column('time', 'ci_upper'),
             
-            # Cabeçalho
-            f.write(f"\n{'Algoritmo':<15} {'CPU(MHz)':<10} {'Energia(J)':<15} {'Tempo(ms)':<12}\n")
-            f.write("-" * 55 + "\n")
+            # EDP (Energy-Delay Product)
+            'edp_valor_J_ms': column('edp', 'mean'),
+            'edp_desvio_J_ms': column('edp', 'std'),
+            'edp_ic95_lower_J_ms': column('edp', 'ci_lower'),
+            'edp_ic95_upper_J_ms': column('edp', 'ci_upper'),
             
-            for algo in sorted(results.keys()):
-                for freq in sorted(results[algo].keys()):
-                    data = results[algo][freq]
-                    f.write(f"{algo:<15} {freq:<10} {data['energy']['mean']:<15.6f} ")
-                    f.write(f"{data['time']['mean']:<12.3f}\n")
-                f.write("\n")
+            # Correlação
+            'correlacao_energia_tempo': column('correlation', 'value'),
+            'correlacao_p_value': column('correlation', 'p_value'),
+            'correlacao_ic95_lower': column('correlation', 'ci_lower'),
+            'correlacao_ic95_upper': column('correlation', 'ci_upper')
+        }
+        
+        return pd.DataFrame(columns)
     
     def generate_consolidated_csv(self, results, output_file='consolidated_data.csv'):
         """Gera CSV consolidado com todas as métricas."""
-        rows = []
-        
-        for algo in sorted(results.keys()):
-            for freq in sorted(results[algo].keys()):
-                data = results[algo][freq]
-                
-                row = {
-                    'algoritmo': algo,
-                    'cpu_frequency_mhz': freq,
-                    'n_observacoes': data['n_samples'],
-                    
-                    # Energia
-                    'energia_valor_J': data['energy']['mean'],
-                    'energia_desvio_J': data['energy']['std'] if data['energy']['std'] is not None else '',
-                    'energia_ic95_lower_J': data['energy']['ci_lower'] if data['energy']['ci_lower'] is not None else '',
-                    'energia_ic95_upper_J': data['energy']['ci_upper'] if data['energy']['ci_upper'] is not None else '',
-                    
-                    # Tempo
-                    'tempo_valor_ms': data['time']['mean'],
-                    'tempo_desvio_ms': data['time']['std'] if data['time']['std'] is not None else '',
-                    'tempo_ic95_lower_ms': data['time']['ci_lower'] if data['time']['ci_lower'] is not None else '',
-                    'tempo_ic95_upper_ms': data['time']['ci_upper'] if data['time']['ci_upper'] is not None else '',
-                    
-                    # EDP (Energy-Delay Product)
-                    'edp_valor_J_ms': data['edp']['mean'],
-                    'edp_desvio_J_ms': data['edp']['std'] if data['edp']['std'] is not None else '',
-                    'edp_ic95_lower_J_ms': data['edp']['ci_lower'] if data['edp']['ci_lower'] is not None else '',
-                    'edp_ic95_upper_J_ms': data['edp']['ci_upper'] if data['edp']['ci_upper'] is not None else '',
-                    
-                    # Correlação
-                    'correlacao_energia_tempo': data['correlation']['value'] if data['correlation']['value'] is not None else '',
-                    'correlacao_p_value': data['correlation']['p_value'] if data['correlation']['p_value'] is not None else ''
-                }
-                
-                rows.append(row)
-        
         # Cria DataFrame e salva
-        df_consolidated = pd.DataFrame(rows)
-        df_consolidated.to_csv(output_file, index=False, encoding='utf-8')
+        df_consolidated = self._results_frame(results)
+        df_consolidated.to_csv(output_file, index=False, encoding='utf-8', lineterminator='\n')
         print(f"📊 CSV consolidado salvo em: {output_file}")
         
         return df_consolidated
@@ -403,27 +1097,22 @@ class EnergyTimeAnalysis:
         print("\nEDP = Energia × Tempo (quanto menor, melhor)")
         print("Prioriza energia, mas penaliza algoritmos que demoram muito.\n")
         
-        # Coleta todos os EDPs para ranking
-        edp_ranking = []
-        for algo in results.keys():
-            for freq in results[algo].keys():
-                edp_ranking.append({
-                    'algorithm': algo,
-                    'frequency': freq,
-                    'edp': results[algo][freq]['edp']['mean'],
-                    'energy': results[algo][freq]['energy']['mean'],
-                    'time': results[algo][freq]['time']['mean']
-                })
-        
-        # Ordena por EDP (menor = melhor)
-        edp_ranking.sort(key=lambda x: x['edp'])
+        table = self._results_frame(results)
+        
+        # Ordena por EDP (menor = melhor); a ordenação estável mantém a ordem
+        # por algoritmo e frequência nos empates
+        ranking = table.sort_values('edp_valor_J_ms', kind='stable')
+        ranking = ranking[['algoritmo', 'cpu_frequency_mhz', 'edp_valor_J_ms',
+                           'energia_valor_J', 'tempo_valor_ms']]
+        ranking.columns = ['algorithm', 'frequency', 'edp', 'energy', 'time']
+        edp_ranking = ranking.to_dict('records')
         
         print("="*80)
         print(f"{'RANK':<6} {'ALGORITMO':<20} {'FREQ':<8} {'EDP (J·ms)':<15} {'Energia (J)':<15} {'Tempo (ms)':<12}")
         print("="*80)
         
         for i, entry in enumerate(edp_ranking[:20], 1):  # Top 20
-            algo_display = entry['algorithm'].replace('_', ' ').title()
+            algo_display = self.algo_names[entry['algorithm']]
             print(f"{i:<6} {algo_display:<20} {entry['frequency']:<8} "
                   f"{entry['edp']:<15.6f} {entry['energy']:<15.6f} {entry['time']:<12.3f}")
         
@@ -432,17 +1121,18 @@ class EnergyTimeAnalysis:
         print("MELHOR FREQUÊNCIA POR ALGORITMO (baseado em EDP)")
         print(f"{'='*80}\n")
         
-        for algo in sorted(results.keys()):
-            frequencies = sorted(results[algo].keys())
-            edps = [(freq, results[algo][freq]['edp']['mean']) for freq in frequencies]
-            
-            # Encontra frequência com menor EDP
-            best_freq, best_edp = min(edps, key=lambda x: x[1])
-            worst_freq, worst_edp = max(edps, key=lambda x: x[1])
-            
-            improvement = ((worst_edp - best_edp) / worst_edp) * 100
-            
-            algo_name = algo.replace('_', ' ').title()
+        # Frequências com menor e maior EDP de cada algoritmo
+        edp_by_algo = table.groupby('algoritmo', sort=False)['edp_valor_J_ms']
+        best = table.loc[edp_by_algo.idxmin()]
+        worst = table.loc[edp_by_algo.idxmax()]
+        best_edps = best['edp_valor_J_ms'].to_numpy()
+        worst_edps = worst['edp_valor_J_ms'].to_numpy()
+        improvements = ((worst_edps - best_edps) / worst_edps) * 100
+        
+        for algo, best_freq, best_edp, worst_freq, worst_edp, improvement in zip(
+                best['algoritmo'], best['cpu_frequency_mhz'], best_edps,
+                worst['cpu_frequency_mhz'], worst_edps, improvements):
+            algo_name = self.algo_names[algo]
             print(f"{algo_name}:")
             print(f"  Melhor configuração: {best_freq} MHz (EDP: {best_edp:.6f} J·ms)")
             print(f"  Pior configuração: {worst_freq} MHz (EDP: {worst_edp:.6f} J·ms)")
@@ -460,20 +1150,26 @@ class EnergyTimeAnalysis:
         
         optimal_frequencies = {}
         
-        for algo in sorted(results.keys()):
-            frequencies = sorted(results[algo].keys())
-            energies = [results[algo][freq]['energy']['mean'] for freq in frequencies]
-            
-            # Encontra frequência com menor consumo energético
-            min_energy_idx = energies.index(min(energies))
-            optimal_freq = frequencies[min_energy_idx]
-            min_energy = energies[min_energy_idx]
-            
-            # Calcula economia energética comparado à frequência mais alta
-            max_freq = frequencies[-1]
-            max_freq_energy = results[algo][max_freq]['energy']['mean']
-            energy_savings = ((max_freq_energy - min_energy) / max_freq_energy) * 100
-            
+        # Matriz algoritmo × frequência da energia média; frequências sem
+        # medição para um algoritmo ficam NaN
+        matrix = self._results_frame(results).pivot(
+            index='algoritmo', columns='cpu_frequency_mhz', values='energia_valor_J'
+        ).reindex(list(results))
+        energy = matrix.to_numpy()
+        frequencies = matrix.columns.to_numpy()
+        rows = np.arange(len(energy))
+        
+        # Frequência com menor consumo energético de cada algoritmo
+        optimal_idx = np.nanargmin(energy, axis=1)
+        # Frequência mais alta medida de cada algoritmo, base da economia energética
+        highest_idx = energy.shape[1] - 1 - np.argmax(~np.isnan(energy[:, ::-1]), axis=1)
+        min_energies = energy[rows, optimal_idx]
+        max_freq_energies = energy[rows, highest_idx]
+        savings = ((max_freq_energies - min_energies) / max_freq_energies) * 100
+        
+        for algo, optimal_freq, min_energy, max_freq, max_freq_energy, energy_savings in zip(
+                results, frequencies[optimal_idx].tolist(), min_energies.tolist(),
+                frequencies[highest_idx].tolist(), max_freq_energies.tolist(), savings.tolist()):
             optimal_frequencies[algo] = {
                 'optimal_freq': optimal_freq,
                 'min_energy': min_energy,
@@ -483,7 +1179,7 @@ class EnergyTimeAnalysis:
             }
             
             # Exibe resultado
-            algo_name = algo.replace('_', ' ').title()
+            algo_name = self.algo_names[algo]
             print(f"{algo_name}:")
             print(f"  Frequência ótima: {optimal_freq} MHz")
             print(f"  Consumo mínimo: {min_energy:.6f} J")
@@ -492,171 +1188,127 @@ class EnergyTimeAnalysis:
         
         return optimal_frequencies
     
+    def _energy_by_algorithm(self, results):
+        """
+        Frequências, energia média e limites do IC de cada algoritmo.
+        
+        Cada algoritmo é uma fatia contígua das colunas de `_results_frame`,
+        sem percorrer o dicionário `results` frequência a frequência. ICs
+        ausentes aparecem como NaN.
+        """
+        table = self._results_frame(results)
+        frequencies = table['cpu_frequency_mhz'].tolist()
+        energies = table['energia_valor_J'].to_numpy()
+        ci_lowers = table['energia_ic95_lower_J'].to_numpy()
+        ci_uppers = table['energia_ic95_upper_J'].to_numpy()
+        
+        sizes = np.array([len(algo_results) for algo_results in results.values()], dtype=np.intp)
+        stops = np.cumsum(sizes)
+        for algo, start, stop in zip(results, stops - sizes, stops):
+            yield (algo, frequencies[start:stop], energies[start:stop],
+                   ci_lowers[start:stop], ci_uppers[start:stop])
+    
     def plot_energy_vs_frequency_individual(self, results, output_dir='results/analysis'):
         """Gera gráficos individuais por algoritmo para identificar frequência ótima."""
-        
-        algorithms = sorted(results.keys())
         colors = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6A994E', '#BC4B51']
         
-        generated_files = []
+        plots = [(self.algo_names[algo], frequencies, energies, ci_lowers, ci_uppers,
+                  colors[i % len(colors)], f"{output_dir}/energy_{algo}.png")
+                 for i, (algo, frequencies, energies, ci_lowers, ci_uppers)
+                 in enumerate(self._energy_by_algorithm(results))]
         
-        for i, algo in enumerate(algorithms):
-            # Cria figura individual para cada algoritmo
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            frequencies = sorted(results[algo].keys())
-            energies = [results[algo][freq]['energy']['mean'] for freq in frequencies]
-            
-            # Verifica se TODAS as frequências têm intervalos de confiança
-            ci_lowers = [results[algo][freq]['energy']['ci_lower'] for freq in frequencies]
-            ci_uppers = [results[algo][freq]['energy']['ci_upper'] for freq in frequencies]
-            has_ci = all(ci is not None for ci in ci_lowers) and all(ci is not None for ci in ci_uppers)
-            
-            color = colors[i % len(colors)]
-            
-            if has_ci:
-                # Todas as frequências têm intervalos de confiança
-                # Calcula erros para errorbar (diferenças da média)
-                yerr_lower = np.array(energies) - np.array(ci_lowers)
-                yerr_upper = np.array(ci_uppers) - np.array(energies)
-                yerr = [yerr_lower, yerr_upper]
-                
-                # Cria gráfico de barras com intervalos de confiança
-                bars = ax.bar(range(len(frequencies)), energies, 
-                             color=color, alpha=0.8, 
-                             yerr=yerr, capsize=8,
-                             error_kw={'ecolor': 'black', 'alpha': 0.8})
-                
-                # Adiciona valores exatos nas barras
-                for j, (bar, energy_val) in enumerate(zip(bars, energies)):
-                    height = bar.get_height()
-                    text_y = height + yerr[1][j] + (max(energies) * 0.05)
-                    ax.text(bar.get_x() + bar.get_width()/2., text_y,
-                           f'{energy_val:.4f} J', ha='center', va='bottom', 
-                           fontsize=10, fontweight='bold')
-            else:
-                # Sem intervalos de confiança ou ICs parciais - apenas barras simples
-                bars = ax.bar(range(len(frequencies)), energies, 
-                             color=color, alpha=0.8)
-                
-                # Adiciona valores exatos nas barras
-                for j, (bar, energy_val) in enumerate(zip(bars, energies)):
-                    height = bar.get_height()
-                    text_y = height + (max(energies) * 0.05)
-                    ax.text(bar.get_x() + bar.get_width()/2., text_y,
-                           f'{energy_val:.4f} J', ha='center', va='bottom', 
-                           fontsize=10, fontweight='bold')
-            
-            # Configurações do gráfico
-            algo_name = algo.replace('_', ' ').title()
-            ax.set_title(f'{algo_name} - Consumo Energético por Frequência CPU', 
-                        fontsize=14, fontweight='bold', pad=20)
-            ax.set_xlabel('Frequência CPU (MHz)', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Consumo de Energia (J)', fontsize=12, fontweight='bold')
-            
-            # Configurações dos ticks
-            ax.set_xticks(range(len(frequencies)))
-            ax.set_xticklabels([f'{freq}' for freq in frequencies], fontsize=11)
-            ax.grid(True, alpha=0.3, axis='y', linestyle='--')
-            
-            plt.tight_layout()
-            
-            # Salva com nome do algoritmo
-            output_file = f"{output_dir}/energy_{algo}.png"
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            generated_files.append(output_file)
+        # Os gráficos são independentes: com n_jobs > 1 cada processo
+        # renderiza um lote de algoritmos com a sua própria figura
+        max_workers = self.n_jobs if self.n_jobs > 0 else os.cpu_count()
+        n_workers = min(len(plots), max_workers)
+        if n_workers > 1:
+            batches = [plots[k::n_workers] for k in range(n_workers)]
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                list(executor.map(_render_energy_plots, batches))
+        else:
+            _render_energy_plots(plots)
         
-        return generated_files
+        return [output_file for *_, output_file in plots]
     
     def plot_energy_vs_frequency(self, results, output_file='energy_vs_frequency.png'):
-        """Gera gráfico consolidado com todos os algoritmos (modo legado)."""
+        """
+        Gera gráfico consolidado com todos os algoritmos (modo legado).
+        
+        Returns:
+            Caminho do gráfico gerado, ou None quando há algoritmos demais
+            e os gráficos individuais já cobrem os mesmos dados.
+        """
         
-        algorithms = sorted(results.keys())
+        algorithms = list(results)
         
-        # Limita a 10 algoritmos no gráfico consolidado
-        if len(algorithms) > 10:
+        # Acima de poucos algoritmos o consolidado só repete os gráficos
+        # individuais, e é a figura mais cara de montar
+        if len(algorithms) > _CONSOLIDATED_MAX_ALGORITHMS:
             print(f"⚠️  Muitos algoritmos ({len(algorithms)}) para gráfico consolidado.")
             print(f"    Gerando apenas gráficos individuais.")
-            return
+            return None
         
-        fig, axes = plt.subplots(1, len(algorithms), figsize=(16, 6))
+        plt = _pyplot()
         
-        # Se só há um algoritmo, axes não é uma lista
-        if len(algorithms) == 1:
-            axes = [axes]
+        # Um único Axes com barras agrupadas por frequência, uma cor por
+        # algoritmo, em vez de um subplot (eixos, ticks, grade) por algoritmo
+        fig, ax = plt.subplots(figsize=(16, 6), layout='constrained')
         
         colors = ['#2E86AB', '#A23B72', '#F18F01']  # Azul, Roxo, Laranja
         
-        for i, algo in enumerate(algorithms):
-            ax = axes[i]
-            
-            frequencies = sorted(results[algo].keys())
-            energies = [results[algo][freq]['energy']['mean'] for freq in frequencies]
+        # Eixo x comum: união das frequências medidas de todos os algoritmos
+        all_frequencies = sorted({freq for algo_results in results.values() for freq in algo_results})
+        x = np.arange(len(all_frequencies))
+        width = 0.8 / len(algorithms)
+        label_margin = 0.0
+        
+        for i, (algo, frequencies, energies, ci_lowers, ci_uppers) in enumerate(
+                self._energy_by_algorithm(results)):
+            positions = x[np.searchsorted(all_frequencies, frequencies)] + i * width
             
             # Verifica se TODAS as frequências têm intervalos de confiança
-            ci_lowers = [results[algo][freq]['energy']['ci_lower'] for freq in frequencies]
-            ci_uppers = [results[algo][freq]['energy']['ci_upper'] for freq in frequencies]
-            has_ci = all(ci is not None for ci in ci_lowers) and all(ci is not None for ci in ci_uppers)
+            has_ci = not (np.isnan(ci_lowers).any() or np.isnan(ci_uppers).any())
             
             if has_ci:
-                # Todas as frequências têm intervalos de confiança
                 # Calcula erros para errorbar (diferenças da média)
-                yerr_lower = np.array(energies) - np.array(ci_lowers)
-                yerr_upper = np.array(ci_uppers) - np.array(energies)
-                yerr = [yerr_lower, yerr_upper]
-                
-                # Cria gráfico de barras com intervalos de confiança
-                bars = ax.bar(range(len(frequencies)), energies, 
-                             color=colors[i % len(colors)], alpha=0.8, 
-                             yerr=yerr, capsize=8,
-                             error_kw={'ecolor': 'black', 'alpha': 0.8})
-                
-                # Adiciona valores exatos nas barras
-                for j, (bar, energy_val) in enumerate(zip(bars, energies)):
-                    height = bar.get_height()
-                    # Posiciona o texto acima da barra (considerando a margem das barras de erro)
-                    text_y = height + yerr[1][j] + (max(energies) * 0.05)  # 5% de margem extra
-                    ax.text(bar.get_x() + bar.get_width()/2., text_y,
-                           f'{energy_val:.4f}', ha='center', va='bottom', 
-                           fontsize=9, fontweight='bold', rotation=0)
+                yerr = [energies - ci_lowers, ci_uppers - energies]
+                bars = ax.bar(positions, energies, width=width,
+                              color=colors[i % len(colors)], alpha=0.8,
+                              label=self.algo_names[algo],
+                              yerr=yerr, capsize=4,
+                              error_kw={'ecolor': 'black', 'alpha': 0.8})
+                tops = ci_uppers
             else:
                 # Sem intervalos de confiança - apenas barras simples
-                bars = ax.bar(range(len(frequencies)), energies, 
-                             color=colors[i % len(colors)], alpha=0.8)
-                
-                # Adiciona valores exatos nas barras
-                for j, (bar, energy_val) in enumerate(zip(bars, energies)):
-                    height = bar.get_height()
-                    text_y = height + (max(energies) * 0.05)  # 5% de margem extra
-                    ax.text(bar.get_x() + bar.get_width()/2., text_y,
-                           f'{energy_val:.4f}', ha='center', va='bottom', 
-                           fontsize=9, fontweight='bold', rotation=0)
-            
-            # Configurações do subplot
-            algo_name = algo.replace('_', ' ').title()
-            ax.set_title(f'{algo_name}', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Frequência CPU (MHz)', fontsize=12, fontweight='bold')
+                bars = ax.bar(positions, energies, width=width,
+                              color=colors[i % len(colors)], alpha=0.8,
+                              label=self.algo_names[algo])
+                tops = energies
             
-            # Apenas o primeiro gráfico tem label do eixo Y
-            if i == 0:
-                ax.set_ylabel('Consumo de Energia (J)', fontsize=12, fontweight='bold')
-            
-            # Configurações dos ticks
-            ax.set_xticks(range(len(frequencies)))
-            ax.set_xticklabels([f'{freq}' for freq in frequencies])
-            ax.grid(True, alpha=0.3, axis='y')
+            # Adiciona valores exatos acima das barras (e das barras de erro)
+            margin = max(energies) * 0.02
+            label_margin = max(label_margin, max(tops) * 1.15)
+            for bar, top, energy_val in zip(bars, tops, energies):
+                ax.text(bar.get_x() + bar.get_width()/2., top + margin,
+                        f'{energy_val:.4f}', ha='center', va='bottom',
+                        fontsize=7, fontweight='bold', rotation=90)
+        
+        # Espaço no topo para os rótulos verticais
+        ax.set_ylim(top=label_margin)
         
-        # Título geral
-        fig.suptitle('Consumo Energético por Frequência CPU', 
-                     fontsize=16, fontweight='bold', y=1.02)
+        ax.set_title('Consumo Energético por Frequência CPU', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Frequência CPU (MHz)', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Consumo de Energia (J)', fontsize=12, fontweight='bold')
+        ax.set_xticks(x + width * (len(algorithms) - 1) / 2)
+        ax.set_xticklabels([f'{freq}' for freq in all_frequencies])
+        ax.grid(True, alpha=0.3, axis='y')
+        ax.legend()
         
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(output_file, dpi=150, pil_kwargs=_PNG_PIL_KWARGS)
+        plt.close(fig)
         
         print(f"📊 Gráfico consolidado salvo em: {output_file}")
+        return output_file
     
     def run_analysis(self):
         """Executa apresentação de dados organizados por frequência."""
@@ -683,7 +1335,8 @@ class EnergyTimeAnalysis:
             print(f"✓ {len(individual_files)} gráficos individuais gerados")
             
             # Gera gráfico consolidado (se não houver muitos algoritmos)
-            self.plot_energy_vs_frequency(results, f"{analysis_dir}/energy_vs_frequency.png")
+            consolidated_file = self.plot_energy_vs_frequency(
+                results, f"{analysis_dir}/energy_vs_frequency.png")
             
             # Gera relatório de texto
             self.generate_frequency_report(results)
@@ -697,7 +1350,8 @@ class EnergyTimeAnalysis:
             print(f"   • Texto: energy_frequency_report.txt")
             print(f"   • CSV:   {analysis_dir}/consolidated_data.csv")
             print(f"\n📊 Gráficos:")
-            print(f"   • Consolidado: {analysis_dir}/energy_vs_frequency.png")
+            if consolidated_file:
+                print(f"   • Consolidado: {consolidated_file}")
             print(f"   • Individuais: {analysis_dir}/energy_<algoritmo>.png ({len(individual_files)} arquivos)")
             print("="*70)
             
@@ -706,6 +1360,17 @@ class EnergyTimeAnalysis:
             raise
 
 
+def _positive_int(value):
+    """Tipo do argparse para inteiros >= 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro >= 1: {value}")
+    return number
+
+
 def main():
     """Função principal."""
     parser = argparse.ArgumentParser(
@@ -727,6 +1392,14 @@ O script detecta automaticamente o formato e extrai a frequência CPU apropriada
     )
     parser.add_argument('csv_source', nargs='?', default='results/',
                        help='Arquivo CSV, padrão glob, ou diretório (padrão: results/)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Processos para calcular as estatísticas e gerar os gráficos em paralelo (0 = todos os núcleos; padrão: 1)')
+    parser.add_argument('--force-bootstrap', action='store_true',
+                       help=f'Usa bootstrap nos ICs da média (padrão: IC t abaixo de {_NORMAL_CI_MIN_SAMPLES} observações, normal a partir daí)')
+    parser.add_argument('--resamples', type=_positive_int, default=DEFAULT_N_RESAMPLES,
+                       help=f'Reamostragens bootstrap por célula (padrão: {DEFAULT_N_RESAMPLES})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help=f'Não usa o cache do bootstrap em disco (padrão: {DEFAULT_CACHE_DIR})')
     
     args = parser.parse_args()
     
@@ -737,7 +1410,10 @@ O script detecta automaticamente o formato e extrai a frequência CPU apropriada
         return
     
     try:
-        analyzer = EnergyTimeAnalysis(args.csv_source)
+        analyzer = EnergyTimeAnalysis(args.csv_source, n_jobs=args.jobs,
+                                      cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+                                      force_bootstrap=args.force_bootstrap,
+                                      n_resamples=args.resamples)
         analyzer.run_analysis()
     except Exception as e:
         print(f"❌ Erro: {e}")